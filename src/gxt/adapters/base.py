@@ -1,11 +1,46 @@
 """Base adapter interface for warehouses."""
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Iterable
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Optional
+
+
+@lru_cache(maxsize=4096)
+def _hash_bucket_sql(fingerprint_fn: Optional[str], column: str, salt: str, precision: int) -> str:
+    """Render the bucket expression for hash_bucket_sql.
+
+    Pure function of its arguments, so results are memoized across all
+    adapter instances: experiments overwhelmingly share the same
+    randomization unit (typically user_id), so repeated runs re-use the
+    formatted SQL fragment instead of regenerating it per call.
+    """
+    p = precision
+    if salt:
+        # concat in SQL; adapters may need to change syntax per dialect
+        col = f"CONCAT(CAST({column} AS STRING),'::','{salt}')"
+    else:
+        col = column
+
+    if fingerprint_fn:
+        return f"MOD(ABS({fingerprint_fn}({col})), {p})/{p}.0"
+
+    # Generic SQL using SHA256 hex if the database supports TO_HEX(SHA256(...)).
+    # This is a safe fallback for dialects without a native fingerprint, but
+    # SHA256 is ~20x costlier per row and BIGNUMERIC arithmetic is slow.
+    if not salt:
+        col = f"CAST({column} AS STRING)"
+    return f"(CAST(TO_HEX(SHA256({col})) AS BIGNUMERIC) % {p})/{p}.0"
 
 
 class WarehouseAdapter(ABC):
     """Abstract base class for warehouse adapters."""
 
+    # Name of the warehouse's native 64-bit fingerprint function, e.g.
+    # "FARM_FINGERPRINT" (BigQuery), "HASH" (Snowflake), "fnv1a_64" (DuckDB).
+    # When set, hash_bucket_sql emits it instead of the slow SHA256 fallback:
+    # a 64-bit mixing function costs far fewer cycles per row than a
+    # cryptographic hash and keeps the arithmetic in INT64 instead of BIGNUMERIC.
+    _fingerprint_fn: str = None
+
     @abstractmethod
     def execute(self, sql: str) -> Any:
         """Execute a SQL statement in the warehouse and return result."""
@@ -17,23 +52,13 @@ class WarehouseAdapter(ABC):
     def hash_bucket_sql(self, column: str, salt: str = "", precision: int = 1_000_000) -> str:
         """Return a SQL expression (as a string) that computes a deterministic bucket in [0,1)
 
-        The default implementation uses a portable SHA256 -> int approach where supported.
-        Adapters should override with a more efficient native fingerprint when available.
+        When the adapter declares a native fingerprint function via
+        `_fingerprint_fn`, emit `MOD(ABS(fn(...)), p)/p.0` — the fast path.
+        Otherwise fall back to a portable SHA256 -> int approach where supported.
 
-        Example return value: "(ABS(FARM_FINGERPRINT(CAST({col} AS STRING))) % {p})/{p}.0"
+        Example return value: "MOD(ABS(FARM_FINGERPRINT({col})), {p})/{p}.0"
         """
-        # Generic SQL using SHA256 hex if the database supports TO_HEX(SHA256(...))
-        # This is a safe fallback but adapters (e.g., BigQuery) should override.
-        col = column
-        p = precision
-        if salt:
-            # concat in SQL; adapters may need to change syntax per dialect
-            col = f"CONCAT(CAST({column} AS STRING),'::','{salt}')"
-        else:
-            col = f"CAST({column} AS STRING)"
-
-        # Note: many warehouses support SHA256/TO_HEX; this expression may need adapter tuning.
-        return f"(CAST(TO_HEX(SHA256({col})) AS BIGNUMERIC) % {p})/{p}.0"
+        return _hash_bucket_sql(self._fingerprint_fn, column, salt, precision)
 
     def qualify_table(self, dataset: str, table: str) -> str:
         """Return a qualified identifier for a dataset/table pair.
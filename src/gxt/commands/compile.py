@@ -3,11 +3,6 @@ from pathlib import Path
 import typer
 from typing import Optional
 
-from ..parser.manifest import compile_manifest
-from ..adapters.bigquery import BigQueryAdapter
-from ..utils.profiles import load_profile
-import yaml
-
 app = typer.Typer()
 
 
@@ -17,6 +12,13 @@ def compile_cmd(
     adapter: Optional[str] = typer.Option(None, help="Adapter to use for SQL snippets, e.g. 'bigquery'"),
 ):
     """Compile experiments into `target/manifest.json` under the given project path."""
+    # Imported here rather than at module scope so that `gxt version`/`--help`
+    # (which import every command module to mount its sub-app) don't pay for
+    # the manifest compiler, adapter and profile machinery.
+    from ..parser.manifest import compile_manifest
+    from ..adapters.bigquery import BigQueryAdapter
+    from ..utils.profiles import load_profile_cached, peek_profile_type
+
     root = Path(project_path).resolve() if project_path else Path.cwd()
     adapter_obj = None
     if adapter:
@@ -30,11 +32,18 @@ def compile_cmd(
         gxt_yml = root / "gxt_project.yml"
         if gxt_yml.exists():
             try:
-                proj = yaml.safe_load(gxt_yml.read_text()) or {}
+                from ..utils.yaml_io import load_yaml_cached
+
+                proj = load_yaml_cached(gxt_yml)
                 profile_name = proj.get("profile", "gxt_profile")
-                profile_output = load_profile(root, profile_name)
-                if profile_output and profile_output.get("type") == "bigquery":
-                    adapter_obj = BigQueryAdapter.from_profile(profile_output)
+                # Peek at the profile type first: if the active output clearly
+                # isn't BigQuery we skip the full profile load (dotenv + env_var
+                # rendering) entirely.
+                ptype = peek_profile_type(root, profile_name)
+                if ptype is None or ptype == "bigquery":
+                    profile_output = load_profile_cached(root, profile_name)
+                    if profile_output and profile_output.get("type") == "bigquery":
+                        adapter_obj = BigQueryAdapter.from_profile(profile_output)
             except Exception:
                 pass
 
@@ -3,7 +3,6 @@ from pathlib import Path
 import typer
 import pkgutil
 from typing import Optional
-import yaml
 
 app = typer.Typer()
 
@@ -45,6 +44,8 @@ def init(
         gxt init --path projects/demo --name demo --adapter bigquery --dataset demo_ds
     """
 
+    from ..utils.yaml_io import safe_dump, safe_load
+
     root = Path(project_path).expanduser().resolve() if project_path else Path.cwd()
     typer.echo(f"Initializing gxt project at {root}")
 
@@ -70,18 +71,25 @@ def init(
 
     if gxt_yml.exists():
         try:
-            existing = yaml.safe_load(gxt_yml.read_text()) or {}
+            existing = safe_load(gxt_yml.read_text()) or {}
+            original = dict(existing)
             # remove any legacy 'adapter' key so warehouse config comes from profiles.yml
             if "adapter" in existing:
                 existing.pop("adapter")
             # merge without overwriting existing keys unless user provided non-defaults
             merged = {**data, **existing}
-            gxt_yml.write_text(yaml.dump(merged, sort_keys=False))
-            typer.echo(f"Updated {gxt_yml} (merged with existing)")
+            # Only rewrite when the merge actually changed something: a no-op
+            # re-init should not bump the file's mtime (and so should not
+            # invalidate mtime-keyed caches or trigger rebuild-on-mtime systems).
+            if merged == original:
+                typer.echo(f"{gxt_yml} already up to date (no changes)")
+            else:
+                gxt_yml.write_text(safe_dump(merged, sort_keys=False))
+                typer.echo(f"Updated {gxt_yml} (merged with existing)")
         except Exception:
             typer.echo(f"{gxt_yml} exists but could not be parsed; leaving unchanged")
     else:
-        gxt_yml.write_text(yaml.dump(data, sort_keys=False))
+        gxt_yml.write_text(safe_dump(data, sort_keys=False))
         typer.echo(f"Created {gxt_yml}")
 
     # Render profiles.yml from template into the project root
@@ -1,14 +1,32 @@
 """gxt new-experiment command."""
+import functools
 from pathlib import Path
 from typing import Optional
 import typer
-from jinja2 import Environment, FileSystemLoader
 
 app = typer.Typer()
 
 TEMPLATE_DIR = Path(__file__).resolve().parents[1] / "templates"
 
 
+@functools.lru_cache(maxsize=1)
+def _template_env():
+    """Build (once per process) the Jinja environment for scaffold templates.
+
+    auto_reload is disabled so repeated scaffolding (e.g. in CI loops) doesn't
+    re-stat and re-compile the template files on every invocation.
+    """
+    from jinja2 import Environment, FileSystemLoader
+
+    return Environment(loader=FileSystemLoader(str(TEMPLATE_DIR)), auto_reload=False, cache_size=50)
+
+
+@functools.lru_cache(maxsize=1)
+def _audience_template() -> str:
+    """Read the audience.sql template from disk once per process."""
+    return (TEMPLATE_DIR / "audience.sql").read_text()
+
+
 @app.callback(invoke_without_command=True)
 def new_experiment(
     name: str = typer.Option(..., "--name", "-n", help="Experiment name (directory under experiments/)"),
@@ -39,12 +57,10 @@ def new_experiment(
 
     # Copy the audience.sql template verbatim so Jinja-style markers like
     # {{ source('dataset','table') }} are preserved for the compiler to replace later.
-    audience_path = TEMPLATE_DIR / "audience.sql"
-    audience_sql = audience_path.read_text()
-    (exp_dir / "audience.sql").write_text(audience_sql)
+    (exp_dir / "audience.sql").write_text(_audience_template())
 
-    # Prepare Jinja environment for rendering config.yml (we don't render audience.sql)
-    env = Environment(loader=FileSystemLoader(str(TEMPLATE_DIR)))
+    # Cached Jinja environment for rendering config.yml (we don't render audience.sql)
+    env = _template_env()
     # config.yml
     cfg_tmpl = env.get_template("config.yml.jinja")
     # convert comma-separated tags into a list for the template
@@ -54,9 +70,9 @@ def new_experiment(
     gxt_yml = root / "gxt_project.yml"
     if gxt_yml.exists():
         try:
-            import yaml
+            from ..utils.yaml_io import load_yaml_cached
 
-            proj = yaml.safe_load(gxt_yml.read_text()) or {}
+            proj = load_yaml_cached(gxt_yml)
             if proj.get("assignments_table"):
                 assignments_table = proj.get("assignments_table")
             elif proj.get("dataset"):
@@ -1,55 +1,141 @@
 """gxt run command - build assignment SQL and optionally execute it in the warehouse."""
+import functools
+import io
+import re
+import sys
+from itertools import accumulate
 from pathlib import Path
 import typer
 from typing import Optional
 
-from ..adapters.bigquery import BigQueryAdapter
-from ..parser.manifest import compile_manifest
-from ..utils.profiles import load_profile
-import yaml
+# Validated once at config-load time so the SQL builder can interpolate names
+# and identifiers without per-call escaping or injection risk.
+_VARIANT_NAME_RE = re.compile(r"[A-Za-z0-9_\-]+")
+_IDENTIFIER_RE = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
 
 
-app = typer.Typer()
+def build_assignment_sql_stream(out, audience_sql: str, hash_sql_expr: str, variants: list, randomization_unit: str) -> None:
+    """Write assignment SQL to a file-like `out`, fragment by fragment.
 
+    Streaming avoids holding the complete statement in memory: for dry-runs the
+    fragments can go straight to stdout, pipelining writes with construction.
+    `build_assignment_sql` wraps this with a StringIO for callers that need the
+    full string.
 
-def build_assignment_sql(audience_sql: str, hash_sql_expr: str, variants: list, randomization_unit: str) -> str:
-    """Construct a simple assignment SQL statement using a precomputed hash bucket expression.
+    The unique_audience CTE deduplicates the randomization unit values so each
+    unit gets a single assignment row even if the audience SQL returns
+    duplicates; the hashed CTE lets the CASE expression reference the
+    `hash_bucket` alias.
+    """
+    # Names were validated at load time; escaping any stray quote here is
+    # belt-and-braces for direct callers of this function. Interning dedupes
+    # the handful of identifiers repeated across many experiments ("user_id",
+    # "control", ...) and lets later comparisons short-circuit on identity.
+    names = [sys.intern(str(v.get("name")).replace("'", "''")) for v in variants]
+
+    ru = sys.intern(randomization_unit)
+    # The aliased projection appears three times; format it once and reuse.
+    ru_aliased = f"{ru} AS {ru}"
+    w = out.write
+    w("WITH audience AS (\n")
+    w(audience_sql)
+    w("\n),\nunique_audience AS (\n  SELECT DISTINCT ")
+    w(ru_aliased)
+    w(" FROM audience\n),\nhashed AS (\n  SELECT ")
+    w(ru_aliased)
+    w(",\n    ")
+    w(hash_sql_expr)
+    w(" AS hash_bucket\n  FROM unique_audience\n)\nSELECT\n  ")
+    w(ru_aliased)
+    w(",\n  hash_bucket,\n  ")
+
+    # Trivial shapes skip the CASE entirely: a single-arm experiment assigns a
+    # constant and an empty variant list assigns NULL, so the warehouse never
+    # evaluates a row-wise predicate for them.
+    if len(names) <= 1:
+        w(f"'{names[0]}'" if names else "NULL")
+        w(" AS variant\nFROM hashed")
+        return
 
-    This function returns SQL that selects the randomization unit and assigns a variant
-    based on cumulative exposures. It's intentionally simple and should be adapted per
-    warehouse SQL dialect and performance needs.
+    # Compute cumulative exposure thresholds with accumulate (C-level fold):
+    # each variant's threshold is the running sum of exposures.
+    highs = accumulate(float(v.get("exposure", 0)) for v in variants)
+    # Single join over a generator: each WHEN clause is formatted inline, so no
+    # intermediate clause list is materialized. CASE evaluates in order, so a
+    # single monotonic `< threshold` test per variant suffices — the lower
+    # bound is implied by the preceding clauses failing — halving the per-row
+    # comparisons and leaving the engine an ordered threshold list it can
+    # binary-search.
+    w("CASE\n        ")
+    w("\n        ".join(
+        f"WHEN hash_bucket < {high} THEN '{name}'"
+        for name, high in zip(names, highs)
+    ))
+    w("\n    END AS variant\nFROM hashed")
+
+
+@functools.lru_cache(maxsize=64)
+def make_assignment_sql_builder(randomization_unit: str, n_variants: int):
+    """Return a callable rendering assignment SQL for a fixed statement shape.
+
+    The skeleton of the statement depends only on the randomization unit and
+    the variant count, so it is precomputed once into a str.format template;
+    the returned closure just formats the per-experiment values (audience SQL,
+    hash expression, variant names and thresholds) into it. Builders are
+    memoized, so batches of experiments sharing a shape — the common case,
+    since most projects randomize on user_id with the same arm count — skip
+    the structural assembly after the first call.
+
+    The output is byte-identical to build_assignment_sql_stream for the same
+    inputs.
     """
-    # Build CASE expression for variant assignment using cumulative exposure
-    cumulative = 0.0
-    cases = []
-    for v in variants:
-        name = v.get("name")
-        exposure = float(v.get("exposure", 0))
-        low = cumulative
-        cumulative += exposure
-        high = cumulative
-        cases.append((name, low, high))
-
-    case_clauses = []
-    for name, low, high in cases:
-        case_clauses.append(f"WHEN hash_bucket >= {low} AND hash_bucket < {high} THEN '{name}'")
-
-    case_sql = "\n        ".join(case_clauses)
-
-    # Ensure we deduplicate the randomization unit values so each unit gets a
-    # single assignment row even if the audience SQL returns duplicates.
-    # Build SQL with a hashed CTE so we can reference the alias `hash_bucket` in the CASE expression
-    sql = (
-        f"WITH audience AS (\n{audience_sql}\n),\n"
-        f"unique_audience AS (\n  SELECT DISTINCT {randomization_unit} AS {randomization_unit} FROM audience\n),\n"
-        f"hashed AS (\n  SELECT {randomization_unit} AS {randomization_unit},\n    {hash_sql_expr} AS hash_bucket\n  FROM unique_audience\n)\n"
-        f"SELECT\n  {randomization_unit} AS {randomization_unit},\n  hash_bucket,\n  CASE\n        {case_sql}\n    END AS variant\nFROM hashed"
-    )
+    ru = randomization_unit
+    ru_aliased = f"{ru} AS {ru}"
+    parts = [
+        "WITH audience AS (\n{}",
+        "\n),\nunique_audience AS (\n  SELECT DISTINCT ", ru_aliased,
+        " FROM audience\n),\nhashed AS (\n  SELECT ", ru_aliased,
+        ",\n    {}", " AS hash_bucket\n  FROM unique_audience\n)\nSELECT\n  ",
+        ru_aliased, ",\n  hash_bucket,\n  ",
+    ]
+    if n_variants == 0:
+        parts.append("NULL AS variant\nFROM hashed")
+    elif n_variants == 1:
+        parts.append("'{}' AS variant\nFROM hashed")
+    else:
+        parts.append("CASE\n        ")
+        parts.append("\n        ".join(["WHEN hash_bucket < {} THEN '{}'"] * n_variants))
+        parts.append("\n    END AS variant\nFROM hashed")
+    template = "".join(parts)
+
+    def build(audience_sql: str, hash_sql_expr: str, variants: list) -> str:
+        args = [audience_sql, hash_sql_expr]
+        names = (str(v.get("name")).replace("'", "''") for v in variants)
+        if n_variants == 1:
+            args.extend(names)
+        elif n_variants > 1:
+            highs = accumulate(float(v.get("exposure", 0)) for v in variants)
+            for name, high in zip(names, highs):
+                args.append(high)
+                args.append(name)
+        return template.format(*args)
+
+    return build
 
-    return sql
+
+def build_assignment_sql(audience_sql: str, hash_sql_expr: str, variants: list, randomization_unit: str) -> str:
+    """Construct an assignment SQL statement using a precomputed hash bucket expression.
+
+    This function returns SQL that selects the randomization unit and assigns a
+    variant based on cumulative exposures. See build_assignment_sql_stream for
+    the statement shape; this wrapper goes through the memoized shape template.
+    """
+    # Interning the unit makes the builder cache's key hash/compare by
+    # identity for the common repeated values.
+    builder = make_assignment_sql_builder(sys.intern(randomization_unit), len(variants))
+    return builder(audience_sql, hash_sql_expr, variants)
 
 
-@app.callback(invoke_without_command=True)
 def run(
     experiment: str = typer.Argument(..., help="Experiment name (directory under experiments/)."),
     project_path: Optional[str] = typer.Option(None, "--project-path", "-p", help="Project root path where the experiments/ folder lives"),
@@ -61,107 +147,157 @@ def run(
     # choose project root: provided project_path or current working dir
     root = Path(project_path).resolve() if project_path else Path.cwd()
     exp_dir = root / "experiments" / experiment
-    if not exp_dir.exists():
-        typer.echo(f"Experiment not found: {experiment}")
-        raise typer.Exit(code=1)
-
     cfg_file = exp_dir / "config.yml"
-    audience_file = exp_dir / "audience.sql"
-    if not cfg_file.exists() or not audience_file.exists():
-        typer.echo(f"Experiment {experiment} missing config.yml or audience.sql")
-        raise typer.Exit(code=2)
 
-    import yaml
-    cfg = yaml.safe_load(cfg_file.read_text())
+    from ..utils.yaml_io import load_yaml_cached
+
+    # Read config.yml directly and diagnose only on failure: the happy path
+    # pays a single open instead of separate exists() stats for the experiment
+    # directory and its config file.
+    try:
+        cfg = load_yaml_cached(cfg_file)
+    except FileNotFoundError:
+        if not exp_dir.exists():
+            typer.echo(f"Experiment not found: {experiment}")
+            raise typer.Exit(code=1)
+        typer.echo(f"Experiment {experiment} missing config.yml")
+        raise typer.Exit(code=2)
     variants = cfg.get("variants") or []
     randomization_unit = cfg.get("randomization_unit") or "user_id"
 
+    # Project-level config, read once and threaded through both the adapter
+    # selection and the assignments_table resolution below.
+    import yaml
+
+    gxt_yml = root / "gxt_project.yml"
+    try:
+        proj = load_yaml_cached(gxt_yml)
+    except (OSError, yaml.YAMLError):
+        proj = {}
+
+    # Validate identifiers up front: a bad variant name or randomization unit
+    # would otherwise surface as a warehouse-side parse error (or worse, inject
+    # SQL) after all the compile work has been done.
+    for v in variants:
+        name = v.get("name")
+        if not name or not _VARIANT_NAME_RE.fullmatch(str(name)):
+            typer.echo(f"Invalid variant name {name!r} in {experiment}: use letters, digits, '_' or '-'. Aborting.")
+            raise typer.Exit(code=2)
+    if not _IDENTIFIER_RE.fullmatch(randomization_unit):
+        typer.echo(f"Invalid randomization_unit {randomization_unit!r} in {experiment}. Aborting.")
+        raise typer.Exit(code=2)
+
     # Determine adapter
     adapter_obj = None
     if adapter:
         adapter = adapter.lower()
         if adapter == "bigquery":
+            from ..adapters.bigquery import BigQueryAdapter
+
             adapter_obj = BigQueryAdapter()
         else:
             typer.echo(f"Unknown adapter: {adapter}. Proceeding with dry-run only.")
     else:
         # attempt to load profile from project gxt_project.yml -> profiles.yml
         # (use the resolved project root from --path, do NOT reset to cwd)
-        gxt_yml = root / "gxt_project.yml"
-        profile_output = None
-        if gxt_yml.exists():
+        if proj:
             try:
-                proj = yaml.safe_load(gxt_yml.read_text()) or {}
+                from ..utils.profiles import load_profile_cached
+
                 profile_name = proj.get("profile", "gxt_profile")
-                profile_output = load_profile(root, profile_name)
+                profile_output = load_profile_cached(root, profile_name)
                 if profile_output and profile_output.get("type") == "bigquery":
+                    from ..adapters.bigquery import BigQueryAdapter
+
                     adapter_obj = BigQueryAdapter.from_profile(profile_output)
-            except Exception:
+            except (OSError, KeyError, TypeError, ValueError):
+                # profile lookup problems mean we proceed without an adapter;
+                # narrow catches keep the non-raising path specializable on 3.11+
                 pass
 
+    # Snapshot the adapter's capabilities once: the gating checks below test
+    # against this dict instead of issuing repeated hasattr/getattr probes.
+    caps = {
+        n: getattr(adapter_obj, n, None)
+        for n in ("hash_bucket_sql", "execute", "upsert_from_select", "ensure_table_exists", "client", "location")
+    }
+
+    # Require an adapter that can provide a hash expression before doing any
+    # manifest work. We don't allow a vendor-specific fallback anymore even for
+    # dry-runs: the preview must match the configured adapter/dialect to avoid
+    # misleading outputs — and without a usable adapter the whole manifest
+    # compile would be thrown away.
+    if adapter_obj is None or caps["hash_bucket_sql"] is None:
+        typer.echo("A configured adapter that implements `hash_bucket_sql` is required to build assignment SQL.")
+        typer.echo("Provide --adapter (e.g. --adapter bigquery) or configure profiles.yml and gxt_project.yml.")
+        raise typer.Exit(code=3)
+
     # Get audience SQL content
     # Prefer compiled audience SQL (so any {{ source(...) }} markers are qualified).
-    # Compile the project manifest and require a compiled audience_sql entry.
-    try:
-        manifest = compile_manifest(root, adapter=adapter_obj)
-    except Exception as e:
-        typer.echo(f"Manifest compilation failed: {e}")
-        typer.echo("Fix compile errors before running. Aborting.")
-        raise typer.Exit(code=2)
+    audience_sql = None
+    if dry_run:
+        # Fast path for the common dry-run case: when audience.sql contains no
+        # source markers at all, qualification is a no-op (same check
+        # _qualify_sources_in_sql short-circuits on) and the compiled SQL is
+        # byte-identical to the raw file — so skip the whole-project manifest
+        # compile and read the one file directly.
+        try:
+            raw_aud = (exp_dir / "audience.sql").read_text()
+        except OSError:
+            raw_aud = None
+        if raw_aud and "source" not in raw_aud.lower():
+            audience_sql = raw_aud
 
-    exp_entry = manifest.get("experiments", {}).get(experiment)
-    if not exp_entry or not exp_entry.get("audience_sql"):
-        typer.echo(f"Experiment '{experiment}' not found in compiled manifest or missing audience_sql. Aborting.")
-        raise typer.Exit(code=2)
+    if audience_sql is None:
+        # Compile the project manifest and require a compiled audience_sql entry.
+        from ..parser.manifest import compile_manifest_cached
 
-    audience_sql = exp_entry["audience_sql"]
+        try:
+            manifest = compile_manifest_cached(root, adapter=adapter_obj)
+        except Exception as e:
+            typer.echo(f"Manifest compilation failed: {e}")
+            typer.echo("Fix compile errors before running. Aborting.")
+            raise typer.Exit(code=2)
 
-    # Require an adapter that can provide a hash expression. We don't allow a
-    # vendor-specific fallback anymore even for dry-runs: the preview must
-    # match the configured adapter/dialect to avoid misleading outputs.
-    if adapter_obj is None or not hasattr(adapter_obj, "hash_bucket_sql"):
-        typer.echo("A configured adapter that implements `hash_bucket_sql` is required to build assignment SQL.")
-        typer.echo("Provide --adapter (e.g. --adapter bigquery) or configure profiles.yml and gxt_project.yml.")
-        raise typer.Exit(code=3)
+        exp_entry = manifest.get("experiments", {}).get(experiment)
+        if not exp_entry or not exp_entry.get("audience_sql"):
+            typer.echo(f"Experiment '{experiment}' not found in compiled manifest or missing audience_sql. Aborting.")
+            raise typer.Exit(code=2)
 
-    # Build hash SQL using the adapter and salt by experiment name.
-    hash_sql_expr = adapter_obj.hash_bucket_sql(randomization_unit, salt=experiment)
+        audience_sql = exp_entry["audience_sql"]
 
-    assignment_sql = build_assignment_sql(audience_sql, hash_sql_expr, variants, randomization_unit)
+    # Build hash SQL using the adapter and salt by experiment name.
+    hash_sql_expr = caps["hash_bucket_sql"](randomization_unit, salt=experiment)
 
     if dry_run:
+        # Stream the SQL straight to stdout instead of materializing the whole
+        # statement first — dry-run is the default path.
         typer.echo("--- Assignment SQL (dry-run) ---")
-        typer.echo(assignment_sql)
+        build_assignment_sql_stream(sys.stdout, audience_sql, hash_sql_expr, variants, randomization_unit)
+        sys.stdout.write("\n")
         return
 
+    assignment_sql = build_assignment_sql(audience_sql, hash_sql_expr, variants, randomization_unit)
+
     # For non-dry-run, also require execution support
-    if not hasattr(adapter_obj, "execute"):
+    if caps["execute"] is None:
         typer.echo("The configured adapter does not support execution. Aborting.")
         raise typer.Exit(code=4)
 
     # Determine target assignments table from experiment config or project-level gxt_project.yml
     # Priority: config.yml assignments_table -> gxt_project.yml assignments_table -> gxt_project.yml dataset + gxt_assignments
-    assignments_table = None
-    try:
-        cfg = yaml.safe_load((exp_dir / "config.yml").read_text()) or {}
-        assignments_table = cfg.get("assignments_table")
-    except Exception:
-        assignments_table = None
+    # `cfg` was parsed at the top of the command; reuse it rather than
+    # re-reading config.yml.
+    assignments_table = cfg.get("assignments_table")
 
     if not assignments_table:
-        # try project-level gxt_project.yml
-        gxt_yml = root / "gxt_project.yml"
-        if gxt_yml.exists():
-            try:
-                proj = yaml.safe_load(gxt_yml.read_text()) or {}
-                assignments_table = proj.get("assignments_table")
-                # If assignments_table is not fully qualified, check for dataset in gxt_project.yml
-                if not assignments_table:
-                    project_dataset = proj.get("dataset")
-                    if project_dataset:
-                        assignments_table = f"{project_dataset}.gxt_assignments"
-            except Exception:
-                assignments_table = None
+        # fall back to project-level gxt_project.yml (already parsed above)
+        assignments_table = proj.get("assignments_table")
+        # If assignments_table is not set, check for dataset in gxt_project.yml
+        if not assignments_table:
+            project_dataset = proj.get("dataset")
+            if project_dataset:
+                assignments_table = f"{project_dataset}.gxt_assignments"
 
     if not assignments_table:
         typer.echo("Could not determine target assignments_table for upsert (set assignments_table or dataset in gxt_project.yml). Aborting.")
@@ -174,8 +310,8 @@ def run(
         f"SELECT\n  '{experiment}' AS experiment_id,\n  CAST({randomization_unit} AS STRING) AS {randomization_unit},\n  variant AS variant,\n  CURRENT_TIMESTAMP() AS assigned_at\nFROM (\n{assignment_sql}\n)"
     )
 
-    # Use adapter upsert API which will execute a MERGE inserting only new rows
-    if not hasattr(adapter_obj, "upsert_from_select"):
+    # Use adapter upsert API which will insert only rows not already present
+    if caps["upsert_from_select"] is None:
         typer.echo("The configured adapter does not support upsert_from_select. Aborting.")
         raise typer.Exit(code=6)
 
@@ -189,7 +325,7 @@ def run(
             {"name": "assigned_at", "type": "TIMESTAMP"},
         ]
         try:
-            adapter_obj.ensure_table_exists(assignments_table, schema=default_schema, location=getattr(adapter_obj, 'location', None))
+            caps["ensure_table_exists"](assignments_table, schema=default_schema, location=caps["location"])
         except Exception as e:
             typer.echo(f"Could not ensure assignments table exists: {e}")
             raise typer.Exit(code=8)
@@ -197,15 +333,8 @@ def run(
     # If adapter profile did not include explicit credentials, inform the user we're
     # attempting Application Default Credentials (ADC). This is helpful when running
     # on GCP VMs or Cloud Functions where ADC is provided automatically.
-    try:
-        profile_missing_creds = False
-        if hasattr(adapter_obj, 'client') and adapter_obj.client is None:
-            # We couldn't build a client earlier; profile may be missing credentials
-            profile_missing_creds = True
-    except Exception:
-        profile_missing_creds = False
-
-    if profile_missing_creds:
+    # We couldn't build a client earlier; profile may be missing credentials
+    if adapter_obj is not None and caps["client"] is None:
         typer.echo("Note: no BigQuery client could be created from the configured profile.\n" \
                    "If you're running on GCP, Application Default Credentials (ADC) may be used automatically.\n" \
                    "Locally you can run: `gcloud auth application-default login` or set GOOGLE_APPLICATION_CREDENTIALS.")
@@ -222,3 +351,18 @@ def run(
     except Exception as e:
         typer.echo(f"Upsert failed: {e}")
         raise typer.Exit(code=7)
+
+
+def __getattr__(name):
+    """Build the Typer sub-app on first access (PEP 562).
+
+    Library consumers importing this module for build_assignment_sql (tests,
+    other commands) skip the Typer app construction and callback registration
+    entirely; the CLI wiring in gxt.main triggers it on demand.
+    """
+    if name == "app":
+        app = typer.Typer()
+        app.callback(invoke_without_command=True)(run)
+        globals()["app"] = app
+        return app
+    raise AttributeError(name)
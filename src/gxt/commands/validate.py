@@ -1,14 +1,40 @@
 """gxt validate command - validate experiments YAML and SQL."""
 from pathlib import Path
 import typer
-import yaml
 from typing import Optional
 
-from ..parser.manifest import compile_manifest
-
 app = typer.Typer()
 
 
+def _read_experiment(exp: Path) -> dict:
+    """Read one experiment directory's files (IO only; no validation).
+
+    Run in a thread pool so open()+read() latency overlaps across experiment
+    directories. Missing files are recorded as None, read failures as error
+    strings; all interpretation happens back on the main thread so the
+    error/warning ordering stays deterministic.
+    """
+    data = {"name": exp.name, "config_raw": None, "config_error": None,
+            "audience_size": None, "audience_error": None}
+    try:
+        # Raw bytes go straight to the YAML loader, which decodes UTF-8
+        # internally — no separate Python-level decode pass.
+        data["config_raw"] = (exp / "config.yml").read_bytes()
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        data["config_error"] = str(e)
+    try:
+        # Only existence and non-emptiness matter for audience.sql, so a stat
+        # suffices; the content is never read here.
+        data["audience_size"] = (exp / "audience.sql").stat().st_size
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        data["audience_error"] = str(e)
+    return data
+
+
 @app.callback(invoke_without_command=True)
 def validate(
     project_path: Optional[str] = typer.Option(None, "--project-path", "-p", help="Project root path where the experiments/ folder lives"),
@@ -20,6 +46,8 @@ def validate(
     Use `--project-path` to point at a project folder instead of running from cwd.
     Use `--strict` to run extra checks (audience.sql presence and manifest compilation).
     """
+    from ..utils.yaml_io import load_yaml, safe_load
+
     root = Path(project_path).resolve() if project_path else Path.cwd()
     experiments = root / "experiments"
     if not experiments.exists():
@@ -28,80 +56,90 @@ def validate(
 
     errors = []
     warnings = []
-    for exp in sorted(experiments.iterdir()):
-        if not exp.is_dir():
+    # One scandir pass picks up the experiment directories (DirEntry caches the
+    # is_dir stat), and the per-directory file reads run concurrently; each
+    # read probes existence via try/except instead of a separate exists() stat.
+    import os
+    from concurrent.futures import ThreadPoolExecutor
+
+    exp_dirs = [Path(e.path) for e in sorted(os.scandir(experiments), key=lambda e: e.name) if e.is_dir()]
+    reads = []
+    if exp_dirs:
+        with ThreadPoolExecutor(max_workers=min(16, len(exp_dirs))) as ex:
+            reads = list(ex.map(_read_experiment, exp_dirs))
+    for data in reads:
+        exp_name = data["name"]
+        if data["config_error"] is not None:
+            errors.append(f"{exp_name}: error parsing config.yml: {data['config_error']}")
             continue
-        cfg_file = exp / "config.yml"
-        if not cfg_file.exists():
-            errors.append(f"{exp.name}: missing config.yml")
+        if data["config_raw"] is None:
+            errors.append(f"{exp_name}: missing config.yml")
             continue
 
-        # Read and parse config.yml with better error reporting
+        # Parse config.yml with better error reporting
         try:
-            raw = cfg_file.read_text()
-            cfg = yaml.safe_load(raw) or {}
+            cfg = safe_load(data["config_raw"]) or {}
         except Exception as e:
-            errors.append(f"{exp.name}: error parsing config.yml: {e}")
+            errors.append(f"{exp_name}: error parsing config.yml: {e}")
             continue
 
         # Validate variants structure and exposures
         variants = cfg.get("variants") or []
         if variants:
             if not isinstance(variants, list):
-                errors.append(f"{exp.name}: 'variants' must be a list")
+                errors.append(f"{exp_name}: 'variants' must be a list")
             else:
                 total = 0.0
                 seen_names = set()
                 for i, v in enumerate(variants):
                     if not isinstance(v, dict):
-                        errors.append(f"{exp.name}: variant at index {i} must be a mapping")
+                        errors.append(f"{exp_name}: variant at index {i} must be a mapping")
                         continue
                     name = v.get("name")
                     if not name:
-                        errors.append(f"{exp.name}: variant at index {i} missing 'name'")
+                        errors.append(f"{exp_name}: variant at index {i} missing 'name'")
                     else:
                         if name in seen_names:
-                            errors.append(f"{exp.name}: duplicate variant name '{name}'")
+                            errors.append(f"{exp_name}: duplicate variant name '{name}'")
                         seen_names.add(name)
                     exp_val = v.get("exposure")
                     try:
                         exp_f = float(exp_val)
                         if exp_f < 0:
-                            errors.append(f"{exp.name}: variant '{name}' has negative exposure {exp_f}")
+                            errors.append(f"{exp_name}: variant '{name}' has negative exposure {exp_f}")
                         total += exp_f
                     except Exception:
-                        errors.append(f"{exp.name}: variant '{name}' has non-numeric exposure: {exp_val}")
+                        errors.append(f"{exp_name}: variant '{name}' has non-numeric exposure: {exp_val}")
 
                 # Validate sum to 1 (tolerance)
                 if abs(total - 1.0) > 1e-6:
-                    errors.append(f"{exp.name}: variant exposures do not sum to 1 (got {total})")
+                    errors.append(f"{exp_name}: variant exposures do not sum to 1 (got {total})")
 
-        # If requested, verify audience.sql exists and is non-empty
-        aud_file = exp / "audience.sql"
-        if not aud_file.exists():
-            warnings.append(f"{exp.name}: missing audience.sql")
-        else:
-            try:
-                aud_text = aud_file.read_text().strip()
-                if not aud_text:
-                    warnings.append(f"{exp.name}: audience.sql is empty")
-            except Exception as e:
-                errors.append(f"{exp.name}: could not read audience.sql: {e}")
+        # Verify audience.sql exists and is non-empty (already statted above)
+        if data["audience_error"] is not None:
+            errors.append(f"{exp_name}: could not read audience.sql: {data['audience_error']}")
+        elif data["audience_size"] is None:
+            warnings.append(f"{exp_name}: missing audience.sql")
+        elif not data["audience_size"]:
+            warnings.append(f"{exp_name}: audience.sql is empty")
 
     # In strict mode, attempt to compile manifest to catch source qualification and adapter-related issues
     if strict:
         try:
             # compile_manifest writes target/manifest.json and will surface parsing issues
+            from ..parser.manifest import compile_manifest
+
             _ = compile_manifest(root)
         except Exception as e:
             errors.append(f"manifest compilation failed: {e}")
 
     # Validate profiles.yml and gxt_project.yml structure
+    profile_output = None
     try:
         proj_yml = root / "gxt_project.yml"
         if proj_yml.exists():
             try:
-                proj = yaml.safe_load(proj_yml.read_text()) or {}
+                proj = load_yaml(proj_yml)
             except Exception as e:
                 errors.append(f"gxt_project.yml: parse error: {e}")
                 proj = {}
@@ -109,16 +147,15 @@ def validate(
             proj = {}
 
         profiles_yml = root / "profiles.yml"
-        profiles = None
         if profiles_yml.exists():
             try:
-                raw = profiles_yml.read_text()
-                # simple env_var rendering used elsewhere in codebase
-                from ..utils.profiles import load_profile as _lp
+                # Load the active output once; the connectivity test below
+                # reuses this instead of re-reading and re-rendering
+                # profiles.yml.
+                from ..utils.profiles import load_profile_cached
 
-                # We won't re-implement rendering here; attempt to load the active output
                 profile_name = proj.get("profile", "gxt_profile")
-                profile_output = _lp(root, profile_name)
+                profile_output = load_profile_cached(root, profile_name)
                 if profile_output is None:
                     errors.append(f"profiles.yml: could not locate profile '{profile_name}' or its target output")
                 else:
@@ -143,11 +180,7 @@ def validate(
     # If strict and profile indicates BigQuery, attempt a lightweight connection test
     if strict:
         try:
-            # reuse profile output from above if available
-            profile_name = proj.get("profile", "gxt_profile")
-            from ..utils.profiles import load_profile as _lp
-
-            profile_output = _lp(root, profile_name)
+            # reuse the profile output loaded above
             if profile_output and profile_output.get("type") == "bigquery":
                 try:
                     # Prefer Application Default Credentials (ADC). This works on
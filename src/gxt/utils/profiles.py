@@ -4,55 +4,312 @@ This provides a tiny helper to read a dbt-style `profiles.yml` and return the
 active output configuration for a given profile name.
 """
 from pathlib import Path
-import yaml
 from typing import Optional, Dict
+import hashlib
+import json
 import os
 import re
-from dotenv import load_dotenv 
+import yaml
+from dotenv import load_dotenv
 
-def load_profile(root: Path, profile_name: str = "gxt_profile") -> Optional[Dict]:
-    """Load profiles.yml from the given project root and return the active output dict.
+from .yaml_io import safe_load
 
-    Returns the output config (e.g. profiles[profile]['outputs'][target]) or None if not found.
+# Names referenced via {{ env_var('FOO') }}; used to build the cache's
+# environment signature so changing a referenced variable invalidates the
+# cached profile without re-reading the file on every lookup.
+_ENV_VAR_NAME_RE = re.compile(r"env_var\(\s*'([^']+)'")
+
+def _render_env_vars(raw: str, _get=os.environ.get) -> str:
+    """Render {{ env_var('KEY'[, 'DEFAULT']) }} tokens with a linear scan.
+
+    str.find skips runs of non-template text at C speed, where a regex pays
+    per-character engine overhead over the whole file. Slices between tokens
+    are collected in a list and joined once; anything that doesn't parse as a
+    well-formed env_var() call is left intact, matching the old regex's
+    no-match behavior.
+    """
+    parts = []
+    pos = 0
+    find = raw.find
+    while True:
+        start = find("{{", pos)
+        if start == -1:
+            break
+        end = find("}}", start + 2)
+        if end == -1:
+            break
+        inner = raw[start + 2:end].strip()
+        replacement = None
+        if inner.startswith("env_var(") and inner.endswith(")"):
+            body = inner[8:-1].strip()
+            if body.startswith("'"):
+                key_end = body.find("'", 1)
+                if key_end > 1:  # key must be non-empty
+                    key = body[1:key_end]
+                    rest = body[key_end + 1:].strip()
+                    if not rest:
+                        replacement = _get(key, "")
+                    elif rest.startswith(","):
+                        default = rest[1:].strip()
+                        if (len(default) >= 2 and default[0] == "'" and default[-1] == "'"
+                                and "'" not in default[1:-1]):
+                            replacement = _get(key, default[1:-1])
+        if replacement is None:
+            parts.append(raw[pos:end + 2])
+        else:
+            parts.append(raw[pos:start])
+            parts.append(replacement)
+        pos = end + 2
+    parts.append(raw[pos:])
+    return "".join(parts)
+
+
+# Sandboxed Jinja environment, built on first use. Only profiles whose
+# template tokens the fast scanner can't resolve ever reach it, so the
+# jinja2 import and Environment construction stay off the common path.
+_JINJA_ENV = None
+
+
+def _jinja_render(raw: str) -> str:
+    """Render template tokens _render_env_vars left unresolved.
+
+    The sandboxed environment restricts what expressions can reach, and the
+    single `env_var` global mirrors the scanner's semantics (missing variables
+    render as the default or empty string), so simple and complex profiles
+    resolve consistently.
+    """
+    global _JINJA_ENV
+    if _JINJA_ENV is None:
+        from jinja2.sandbox import SandboxedEnvironment
+
+        _JINJA_ENV = SandboxedEnvironment(autoescape=False)
+        _JINJA_ENV.globals["env_var"] = lambda key, default="": os.environ.get(key, default)
+    return _JINJA_ENV.from_string(raw).render()
+
+
+# (profiles_path, profile_name, mtime_ns) -> (env_names, env_values, result)
+_PROFILE_CACHE: dict = {}
+
+
+def _profile_sidecar_path(profiles_path: Path) -> Path:
+    return profiles_path.parent / ".gxt_cache" / (profiles_path.name + ".profile.json")
+
+
+def _env_digest(value: Optional[str]) -> Optional[str]:
+    """Hash an env-var value for the sidecar; values may be credentials."""
+    return hashlib.sha256(value.encode("utf-8")).hexdigest() if value is not None else None
+
+
+def _load_profile_sidecar(profiles_path: Path, profile_name: str, mtime_ns: int):
+    """Return the resolved output from the on-disk sidecar, or None on any mismatch.
+
+    Valid only when the recorded mtime, profile name and digests of the current
+    values of every env var the file references all match — the same
+    invalidation rules as the in-process cache, surviving across processes.
+    """
+    try:
+        with open(_profile_sidecar_path(profiles_path), "rb") as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if entry.get("mtime_ns") != mtime_ns or entry.get("profile") != profile_name:
+        return None
+    env_names = tuple(entry.get("env_names") or ())
+    if [_env_digest(os.environ.get(n)) for n in env_names] != (entry.get("env_digests") or []):
+        return None
+    env_values = tuple(os.environ.get(n) for n in env_names)
+    return env_names, env_values, entry.get("output")
+
+
+def _write_profile_sidecar(profiles_path: Path, profile_name: str, mtime_ns: int,
+                           env_names: tuple, output: Optional[Dict]) -> None:
+    """Refresh the sidecar; failures (read-only fs, odd types) skip the cache.
+
+    Opt-in via GXT_PROFILE_CACHE — the sidecar duplicates profile content to
+    plaintext, which not every project wants on disk. Even then, profiles that
+    substitute env vars are never persisted: the rendered output (and the
+    values themselves) routinely hold credentials that exist only in the
+    environment, and the cache must not widen where they live. Only env-value
+    digests are stored, and the file is created 0600.
+    """
+    if not os.environ.get("GXT_PROFILE_CACHE"):
+        return
+    if env_names:
+        return
+    sidecar = _profile_sidecar_path(profiles_path)
+    try:
+        payload = json.dumps({
+            "mtime_ns": mtime_ns,
+            "profile": profile_name,
+            "env_names": [],
+            "env_digests": [],
+            "output": output,
+        })
+        sidecar.parent.mkdir(exist_ok=True)
+        tmp = sidecar.parent / (sidecar.name + ".tmp")
+        tmp.write_text(payload)
+        os.chmod(tmp, 0o600)
+        os.replace(tmp, sidecar)
+    except (TypeError, OSError):
+        pass
+
+# .env paths already handed to load_dotenv this process; dotenv re-parses the
+# file on every call, so the guard makes repeat profile loads no-ops.
+_DOTENV_LOADED: set = set()
+
+
+def _reset_dotenv_cache() -> None:
+    """Forget which .env files were loaded (intended for tests)."""
+    _DOTENV_LOADED.clear()
+
+
+def clear_profile_cache() -> None:
+    """Drop all cached profile lookups (intended for tests)."""
+    _PROFILE_CACHE.clear()
+
+
+def load_profile_cached(root: Path, profile_name: str = "gxt_profile") -> Optional[Dict]:
+    """Memoized load_profile keyed on (profiles.yml path, profile_name, mtime).
+
+    Repeat lookups within a process (batched runs, validate's double load,
+    tests) skip the dotenv load, env_var rendering and YAML parse. The file's
+    mtime is part of the key, so on-disk edits invalidate the entry, and the
+    values of any env vars the profile references are compared on each hit so
+    environment changes invalidate it too. With GXT_PROFILE_CACHE set, a JSON
+    sidecar under `.gxt_cache/` additionally persists the resolved output of
+    env-var-free profiles across processes, so cold starts pay a json.load
+    instead of dotenv + rendering + YAML parsing.
     """
     profiles_path = root / "profiles.yml"
-    if not profiles_path.exists():
+    try:
+        mtime_ns = profiles_path.stat().st_mtime_ns
+    except OSError:
         return None
+    key = (str(profiles_path), profile_name, mtime_ns)
+    hit = _PROFILE_CACHE.get(key)
+    if hit is not None:
+        env_names, env_values, result = hit
+        if tuple(os.environ.get(n) for n in env_names) == env_values:
+            return result
+
+    persisted = _load_profile_sidecar(profiles_path, profile_name, mtime_ns)
+    if persisted is not None:
+        _PROFILE_CACHE[key] = persisted
+        return persisted[2]
+
+    result = load_profile(root, profile_name)
     try:
-        # If a .env file exists at the project root, load its values into the
-        # environment for the purpose of rendering profiles.yml. We only set
-        # variables that are not already present in os.environ so we don't
-        # override user environment.
-        # Require python-dotenv for parsing .env files. This simplifies parsing
-        # and makes behavior consistent. If python-dotenv is not installed,
-        # raise a clear error instructing users to install it.
-
-        env_path = str(root / ".env")
-        # load_dotenv will not override existing env vars by default
-        load_dotenv(env_path)
-
-        raw = profiles_path.read_text()
-        # simple rendering for {{ env_var('FOO') }} and {{ env_var('FOO','default') }}
-        def _replace_env_var(match):
-            key = match.group(1)
-            default = match.group(2) if match.group(2) is not None else ""
-            return os.environ.get(key, default)
-
-        rendered = re.sub(r"\{\{\s*env_var\(\s*'([^']+)'\s*(?:,\s*'([^']*)')?\s*\)\s*\}\}", _replace_env_var, raw)
-        data = yaml.safe_load(rendered) or {}
+        env_names = tuple(sorted(set(_ENV_VAR_NAME_RE.findall(profiles_path.read_text()))))
+    except OSError:
+        env_names = ()
+    env_values = tuple(os.environ.get(n) for n in env_names)
+    _PROFILE_CACHE[key] = (env_names, env_values, result)
+    _write_profile_sidecar(profiles_path, profile_name, mtime_ns, env_names, result)
+    return result
+
+
+def peek_profile_type(root: Path, profile_name: str = "gxt_profile") -> Optional[str]:
+    """Cheaply read the active output's `type` from profiles.yml.
+
+    Unlike `load_profile`, this skips .env loading and env_var rendering — the
+    `type` field is a plain scalar in practice — so callers that only need to
+    know the warehouse flavor (e.g. adapter detection in `gxt compile`) don't
+    pay for full profile resolution. Returns None when the type can't be
+    determined; callers should then fall back to `load_profile`.
+    """
+    profiles_path = root / "profiles.yml"
+    try:
+        data = safe_load(profiles_path.read_bytes()) or {}
         profile = data.get(profile_name)
-        if not profile:
+        if not isinstance(profile, dict):
             return None
-        target = profile.get("target")
-        outputs = profile.get("outputs", {})
-        output = outputs.get(target)
+        outputs = profile.get("outputs")
+        if not isinstance(outputs, dict):
+            return None
+        output = outputs.get(profile.get("target"))
         if not isinstance(output, dict):
             return None
+        ptype = output.get("type")
+        # A templated type (e.g. "{{ env_var('WH_TYPE') }}") needs full
+        # rendering to resolve; returning the raw token would defeat the
+        # fall-back-to-load_profile contract, so report "undetermined".
+        if not isinstance(ptype, str) or "{{" in ptype:
+            return None
+        return ptype
+    except Exception:
+        return None
 
-        # Normalize keys: Snowflake uses 'schema', BigQuery uses 'dataset'
-        if "schema" in output and "dataset" not in output:
-            output["dataset"] = output.get("schema")
 
-        return output
-    except Exception:
+def load_profile(root: Path, profile_name: str = "gxt_profile") -> Optional[Dict]:
+    """Load profiles.yml from the given project root and return the active output dict.
+
+    Returns the output config (e.g. profiles[profile]['outputs'][target]) or None if not found.
+    """
+    profiles_path = root / "profiles.yml"
+    try:
+        raw_bytes = profiles_path.read_bytes()
+    except OSError:
         return None
+    # If a .env file exists at the project root, its values are loaded into
+    # the environment for rendering profiles.yml; load_dotenv never overrides
+    # variables already present in os.environ.
+    return load_profile_from_text(raw_bytes, env_path=str(root / ".env"), profile_name=profile_name)
+
+
+def load_profile_from_text(text, env_path: Optional[str] = None, profile_name: str = "gxt_profile") -> Optional[Dict]:
+    """Resolve the active output from profiles.yml content already in memory.
+
+    Factored out of load_profile so callers that already hold the content —
+    unit tests most of all — skip the filesystem entirely. `text` may be str
+    or bytes; untemplated bytes go straight to the loader, which decodes
+    UTF-8 internally, so Python's codec layer never makes a str copy.
+    """
+    try:
+        if env_path is not None and env_path not in _DOTENV_LOADED:
+            # Parse each .env at most once per process; load_dotenv tolerates
+            # a missing file.
+            load_dotenv(env_path)
+            _DOTENV_LOADED.add(env_path)
+
+        # simple rendering for {{ env_var('FOO') }} and {{ env_var('FOO','default') }};
+        # most profiles reference no env vars, so the substring test skips the
+        # full scan on the common path.
+        if isinstance(text, bytes):
+            rendered = _render_env_vars(text.decode("utf-8")) if b"env_var(" in text else text
+        else:
+            rendered = _render_env_vars(text) if "env_var(" in text else text
+        # Tokens the scanner couldn't resolve (filters, expressions, unusual
+        # quoting) fall through to a sandboxed Jinja render; a render failure
+        # keeps the scanner's output, matching the old leave-intact behavior.
+        if (b"{{" in rendered) if isinstance(rendered, bytes) else ("{{" in rendered):
+            try:
+                rendered = _jinja_render(
+                    rendered.decode("utf-8") if isinstance(rendered, bytes) else rendered
+                )
+            except Exception:
+                pass
+        data = safe_load(rendered) or {}
+    except (OSError, UnicodeDecodeError, yaml.YAMLError):
+        # Unreadable or unparseable profiles are reported as "no profile";
+        # anything else is a real bug and should surface. The navigation below
+        # sits outside the try so the success path stays narrow.
+        return None
+
+    if not isinstance(data, dict):
+        return None
+    profile = data.get(profile_name)
+    if not isinstance(profile, dict):
+        return None
+    outputs = profile.get("outputs")
+    output = outputs.get(profile.get("target")) if isinstance(outputs, dict) else None
+    if not isinstance(output, dict):
+        return None
+
+    # Normalize keys: Snowflake uses 'schema', BigQuery uses 'dataset'.
+    # Build a new dict rather than mutating the parsed tree: the result
+    # may be memoized and shared across callers, so in-place writes would
+    # leak between them.
+    if "schema" in output and "dataset" not in output:
+        output = dict(output, dataset=output["schema"])
+
+    return output
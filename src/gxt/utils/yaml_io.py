@@ -0,0 +1,116 @@
+"""YAML load/dump helpers backed by libyaml's C implementation when available.
+
+`yaml.safe_load` defaults to the pure-Python loader, which is roughly 10x
+slower than the C loader for the small config files gxt parses in bulk
+(e.g. `gxt list` over many experiments). These helpers pick the C variants
+when PyYAML was built against libyaml and fall back transparently otherwise.
+"""
+import functools
+import json
+import os
+from pathlib import Path
+
+import yaml
+
+_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+_DUMPER = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+
+def safe_load(stream):
+    """Equivalent of yaml.safe_load using the C loader when present."""
+    return yaml.load(stream, Loader=_LOADER)
+
+
+def safe_dump(data, **kwargs) -> str:
+    """Equivalent of yaml.dump(..., Dumper=SafeDumper) using the C dumper when present."""
+    return yaml.dump(data, Dumper=_DUMPER, **kwargs)
+
+
+def load_yaml(path) -> dict:
+    """Parse a YAML file into a dict, without the mtime cache.
+
+    Empty files short-circuit on the stat (no parser startup), and raw bytes
+    go straight to the loader, which decodes UTF-8 internally — no separate
+    Python-level decode pass.
+    """
+    path = Path(path)
+    if path.stat().st_size == 0:
+        return {}
+    return safe_load(path.read_bytes()) or {}
+
+
+@functools.lru_cache(maxsize=256)
+def _cache_root(dir_str: str) -> str:
+    """Locate the project root whose .gxt_cache/ should hold a file's sidecar.
+
+    Walks up from the file's directory to the nearest ancestor that looks
+    like a gxt project (has gxt_project.yml or an experiments/ dir), so all
+    sidecars for one project land in a single cache directory instead of a
+    .gxt_cache/ scattered into every experiments/<name>/ folder. Falls back
+    to the file's own directory when no project marker is found.
+    """
+    d = Path(dir_str)
+    for candidate in (d, *d.parents):
+        if (candidate / "gxt_project.yml").exists() or (candidate / "experiments").is_dir():
+            return str(candidate)
+    return dir_str
+
+
+def _sidecar_path(path: Path) -> Path:
+    root = Path(_cache_root(str(path.parent)))
+    try:
+        rel = path.resolve().relative_to(root.resolve())
+    except ValueError:
+        rel = Path(path.name)
+    # Flatten the relative path into the file name so one directory holds
+    # every sidecar (e.g. experiments__exp1__config.yml.cache.json).
+    return root / ".gxt_cache" / ("__".join(rel.parts) + ".cache.json")
+
+
+@functools.lru_cache(maxsize=64)
+def _load_yaml_cached(path_str: str, mtime_ns: int) -> dict:
+    path = Path(path_str)
+    sidecar = _sidecar_path(path)
+
+    # Prefer the JSON sidecar when it matches the YAML file's mtime: json.load
+    # is an order of magnitude faster than YAML parsing, which matters for
+    # batch/CI workflows spawning a fresh process per gxt invocation.
+    try:
+        with open(sidecar, "rb") as f:
+            entry = json.load(f)
+        if entry.get("mtime_ns") == mtime_ns:
+            return entry["data"] or {}
+    except (OSError, ValueError, KeyError):
+        pass
+
+    # Hand raw bytes to the loader: the libyaml scanner decodes UTF-8
+    # internally, so read_text()'s separate Python-level decode pass is
+    # redundant work.
+    data = safe_load(path.read_bytes()) or {}
+
+    # Refresh the sidecar; written atomically via os.replace so concurrent
+    # readers never see a torn file. Content that doesn't round-trip through
+    # JSON (e.g. YAML dates) or a read-only filesystem simply skips the cache.
+    try:
+        payload = json.dumps({"mtime_ns": mtime_ns, "data": data})
+        sidecar.parent.mkdir(exist_ok=True)
+        tmp = sidecar.parent / (sidecar.name + ".tmp")
+        tmp.write_text(payload)
+        os.replace(tmp, sidecar)
+    except (TypeError, OSError):
+        pass
+
+    return data
+
+
+def load_yaml_cached(path) -> dict:
+    """Parse a YAML file, reusing the cached result while its mtime is unchanged.
+
+    Within a single process that touches the same file repeatedly (e.g.
+    `gxt compile` followed by `gxt run`, or scripted loops), the re-parse
+    becomes an O(1) cache hit. The file's mtime is part of the cache key so
+    edits on disk invalidate the entry. Callers must not mutate the returned
+    dict — it is shared across cache hits.
+    """
+    path = Path(path)
+    return _load_yaml_cached(str(path), path.stat().st_mtime_ns)
@@ -1,33 +1,50 @@
 import pytest
-from unittest.mock import Mock, patch
+from unittest.mock import MagicMock, Mock, patch
 from gxt.adapters.bigquery import BigQueryAdapter
 
 
+@pytest.fixture(scope='module')
+def bq_client_mock():
+    """One shared client stub for the whole module.
+
+    Mock construction builds an attribute tree lazily per instance; reusing a
+    single MagicMock avoids repeating that setup in every test. The autouse
+    reset below wipes calls and configured return values between tests.
+    """
+    return MagicMock()
+
+
+@pytest.fixture(autouse=True)
+def _reset_bq_client(bq_client_mock):
+    yield
+    bq_client_mock.reset_mock(return_value=True, side_effect=True)
+
+
 @pytest.mark.unit
 class TestBigQueryAdapter:
     """Test the BigQuery adapter methods."""
     
-    def test_hash_bucket_sql_generation(self):
+    def test_hash_bucket_sql_generation(self, bq_client_mock):
         """Test hash bucket SQL generation."""
-        adapter = BigQueryAdapter(client=Mock())
+        adapter = BigQueryAdapter(client=bq_client_mock)
         
         result = adapter.hash_bucket_sql("user_id", "10")
         
         expected = "MOD(ABS(FARM_FINGERPRINT(CONCAT(CAST(user_id AS STRING),'::','10'))), 1000000)/1000000.0"
         assert result == expected
     
-    def test_hash_bucket_sql_without_salt(self):
+    def test_hash_bucket_sql_without_salt(self, bq_client_mock):
         """Test hash bucket SQL without salt."""
-        adapter = BigQueryAdapter(client=Mock())
+        adapter = BigQueryAdapter(client=bq_client_mock)
         
         result = adapter.hash_bucket_sql("user_id")
         
         expected = "MOD(ABS(FARM_FINGERPRINT(user_id)), 1000000)/1000000.0"
         assert result == expected
     
-    def test_hash_bucket_sql_different_columns_and_salts(self):
+    def test_hash_bucket_sql_different_columns_and_salts(self, bq_client_mock):
         """Test hash bucket SQL with different parameters."""
-        adapter = BigQueryAdapter(client=Mock())
+        adapter = BigQueryAdapter(client=bq_client_mock)
         
         test_cases = [
             ("customer_id", "5", "MOD(ABS(FARM_FINGERPRINT(CONCAT(CAST(customer_id AS STRING),'::','5'))), 1000000)/1000000.0"),
@@ -39,27 +56,27 @@ class TestBigQueryAdapter:
             result = adapter.hash_bucket_sql(column, salt)
             assert result == expected
     
-    def test_qualify_table_with_project_and_dataset(self):
+    def test_qualify_table_with_project_and_dataset(self, bq_client_mock):
         """Test table qualification with project and dataset."""
-        adapter = BigQueryAdapter(project="my_project", client=Mock())
+        adapter = BigQueryAdapter(project="my_project", client=bq_client_mock)
         
         result = adapter.qualify_table("my_dataset", "my_table")
         
         expected = "`my_project.my_dataset.my_table`"
         assert result == expected
     
-    def test_qualify_table_without_project(self):
+    def test_qualify_table_without_project(self, bq_client_mock):
         """Test table qualification without project."""
-        adapter = BigQueryAdapter(client=Mock())
+        adapter = BigQueryAdapter(client=bq_client_mock)
         
         result = adapter.qualify_table("my_dataset", "my_table")
         
         expected = "`my_dataset.my_table`"
         assert result == expected
     
-    def test_upsert_from_select_sql_generation(self):
-        """Test MERGE SQL generation for upsert operations."""
-        mock_client = Mock()
+    def test_upsert_from_select_sql_generation(self, bq_client_mock):
+        """Test insert-if-absent SQL generation for upsert operations."""
+        mock_client = bq_client_mock
         adapter = BigQueryAdapter(client=mock_client)
         
         src_select_sql = "SELECT user_id, experiment_name, assignment_bucket FROM assignments"
@@ -88,19 +105,87 @@ class TestBigQueryAdapter:
         # Get the actual SQL that was executed
         executed_sql = mock_client.query.call_args[0][0]
         
-        # Verify MERGE statement structure
-        assert "MERGE" in executed_sql
+        # Verify INSERT ... WHERE NOT EXISTS statement structure
+        assert "INSERT INTO" in executed_sql
         assert target_table in executed_sql
-        assert "USING" in executed_sql
-        assert "ON" in executed_sql
-        assert "WHEN NOT MATCHED THEN" in executed_sql
-        assert "INSERT" in executed_sql
+        assert "SELECT" in executed_sql
+        assert "WHERE NOT EXISTS" in executed_sql
+        assert "T.user_id = S.user_id" in executed_sql
+        assert "T.experiment_name = S.experiment_name" in executed_sql
         
         # Verify columns are included
         for column in insert_columns:
             assert column in executed_sql
     
-    @patch('gxt.adapters.bigquery.bigquery.Client')
+    def test_insert_rows_chunking(self, bq_client_mock):
+        """Test that streamed inserts are split into chunk_size batches."""
+        adapter = BigQueryAdapter(client=bq_client_mock)
+        bq_client_mock.insert_rows_json.return_value = []
+
+        adapter.insert_rows("ds.table", [{"n": i} for i in range(1250)])
+
+        chunk_sizes = [len(c.args[1]) for c in bq_client_mock.insert_rows_json.call_args_list]
+        assert chunk_sizes == [500, 500, 250]
+
+    def test_insert_rows_aggregates_errors_across_chunks(self, bq_client_mock):
+        """Test that per-chunk errors are collected and raised after all chunks."""
+        adapter = BigQueryAdapter(client=bq_client_mock)
+        bq_client_mock.insert_rows_json.side_effect = [
+            [{'index': 0, 'errors': ['bad row']}],
+            [],
+            [{'index': 7, 'errors': ['another bad row']}],
+        ]
+
+        with pytest.raises(RuntimeError) as exc_info:
+            adapter.insert_rows("ds.table", [{"n": i} for i in range(1250)])
+
+        # All chunks were sent before raising, and both errors are reported
+        assert bq_client_mock.insert_rows_json.call_count == 3
+        assert 'bad row' in str(exc_info.value)
+        assert 'another bad row' in str(exc_info.value)
+
+    def test_insert_rows_routes_large_list_to_load_job(self, bq_client_mock):
+        """Test that list payloads over the threshold use a load job."""
+        adapter = BigQueryAdapter(client=bq_client_mock)
+        rows = [{"n": i} for i in range(BigQueryAdapter.LOAD_JOB_ROW_THRESHOLD + 1)]
+
+        adapter.insert_rows("ds.table", rows)
+
+        bq_client_mock.load_table_from_file.assert_called_once()
+        bq_client_mock.insert_rows_json.assert_not_called()
+
+    def test_insert_rows_routes_large_generator_to_load_job(self, bq_client_mock):
+        """Test that generator payloads over the threshold use a load job."""
+        adapter = BigQueryAdapter(client=bq_client_mock)
+        rows = ({"n": i} for i in range(BigQueryAdapter.LOAD_JOB_ROW_THRESHOLD + 1))
+
+        adapter.insert_rows("ds.table", rows)
+
+        bq_client_mock.load_table_from_file.assert_called_once()
+        bq_client_mock.insert_rows_json.assert_not_called()
+
+    def test_insert_rows_generator_under_threshold_streams(self, bq_client_mock):
+        """Test that a small generator still goes through the streaming API."""
+        adapter = BigQueryAdapter(client=bq_client_mock)
+        bq_client_mock.insert_rows_json.return_value = []
+
+        adapter.insert_rows("ds.table", ({"n": i} for i in range(750)))
+
+        chunk_sizes = [len(c.args[1]) for c in bq_client_mock.insert_rows_json.call_args_list]
+        assert chunk_sizes == [500, 250]
+        bq_client_mock.load_table_from_file.assert_not_called()
+
+    def test_insert_rows_without_client_prints_count(self, capsys):
+        """Test the no-client fallback reports the row count without an API call."""
+        adapter = BigQueryAdapter()
+
+        adapter.insert_rows("ds.table", ({"n": i} for i in range(10)))
+
+        out = capsys.readouterr().out
+        assert "ds.table" in out
+        assert "10 rows" in out
+
+    @patch('google.cloud.bigquery.Client')
     def test_from_profile_with_explicit_credentials(self, mock_client_class):
         """Test creating adapter from profile with explicit credentials."""
         mock_client = Mock()
@@ -122,7 +207,7 @@ class TestBigQueryAdapter:
         assert adapter.dataset == 'test_dataset'
         assert adapter.client == mock_client
     
-    @patch('gxt.adapters.bigquery.bigquery.Client')
+    @patch('google.cloud.bigquery.Client')
     def test_from_profile_with_adc(self, mock_client_class):
         """Test creating adapter from profile with Application Default Credentials."""
         mock_client = Mock()
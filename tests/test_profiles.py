@@ -1,18 +1,42 @@
 import pytest
-import tempfile
-import os
 from pathlib import Path
-from unittest.mock import patch, mock_open
-from gxt.utils.profiles import load_profile
+from unittest.mock import Mock, patch
+from gxt.utils.profiles import load_profile, load_profile_from_text
+
+
+@pytest.fixture(autouse=True)
+def _no_dotenv(monkeypatch):
+    """Keep .env file IO out of these tests.
+
+    Substitution semantics and return-value plumbing don't depend on dotenv;
+    the dedicated dotenv test installs its own patch on top of this one.
+    """
+    monkeypatch.setattr('gxt.utils.profiles.load_dotenv', Mock())
+
+
+@pytest.fixture
+def write_profile(tmp_path):
+    """Write profiles.yml (and optionally .env) into a per-test directory.
+
+    Built on pytest's tmp_path so every test — and every pytest-xdist
+    worker — gets an isolated directory without the TemporaryDirectory
+    boilerplate.
+    """
+    def _write(content: str, env: str = None) -> Path:
+        (tmp_path / "profiles.yml").write_text(content)
+        if env is not None:
+            (tmp_path / ".env").write_text(env)
+        return tmp_path
+    return _write
 
 
 @pytest.mark.unit
 class TestProfileLoading:
     """Test profile loading and environment variable substitution."""
-    
-    def test_load_profile_basic(self):
+
+    def test_load_profile_basic(self, write_profile):
         """Test basic profile loading without environment variables."""
-        profile_content = """
+        root = write_profile("""
 gxt_profile:
   target: target
   outputs:
@@ -20,21 +44,18 @@ gxt_profile:
       type: bigquery
       project: test-project
       dataset: test_dataset
-"""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            profiles_path = Path(temp_dir) / "profiles.yml"
-            profiles_path.write_text(profile_content)
-            
-            profile = load_profile(Path(temp_dir), 'gxt_profile')
-            
-            assert profile['type'] == 'bigquery'
-            assert profile['project'] == 'test-project' 
-            assert profile['dataset'] == 'test_dataset'
-    
-    @patch.dict(os.environ, {'TEST_PROJECT': 'env-project', 'TEST_DATASET': 'env_dataset'})
-    def test_load_profile_with_env_vars(self):
+""")
+        profile = load_profile(root, 'gxt_profile')
+
+        assert profile['type'] == 'bigquery'
+        assert profile['project'] == 'test-project'
+        assert profile['dataset'] == 'test_dataset'
+
+    def test_load_profile_with_env_vars(self, monkeypatch):
         """Test profile loading with environment variable substitution."""
-        profile_content = """
+        monkeypatch.setenv('TEST_PROJECT', 'env-project')
+        monkeypatch.setenv('TEST_DATASET', 'env_dataset')
+        profile = load_profile_from_text("""
 gxt_profile:
   target: target
   outputs:
@@ -42,21 +63,16 @@ gxt_profile:
       type: bigquery
       project: "{{ env_var('TEST_PROJECT') }}"
       dataset: "{{ env_var('TEST_DATASET') }}"
-"""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            profiles_path = Path(temp_dir) / "profiles.yml"
-            profiles_path.write_text(profile_content)
-            
-            profile = load_profile(Path(temp_dir), 'gxt_profile')
-            
-            assert profile['type'] == 'bigquery'
-            assert profile['project'] == 'env-project'
-            assert profile['dataset'] == 'env_dataset'
-    
-    @patch.dict(os.environ, {'KEYFILE_PATH': '/path/to/service-account.json'})
-    def test_load_profile_with_optional_env_var(self):
+""", profile_name='gxt_profile')
+
+        assert profile['type'] == 'bigquery'
+        assert profile['project'] == 'env-project'
+        assert profile['dataset'] == 'env_dataset'
+
+    def test_load_profile_with_optional_env_var(self, monkeypatch):
         """Test profile loading with optional environment variables."""
-        profile_content = """
+        monkeypatch.setenv('KEYFILE_PATH', '/path/to/service-account.json')
+        profile = load_profile_from_text("""
 gxt_profile:
   target: target
   outputs:
@@ -65,21 +81,17 @@ gxt_profile:
       project: test-project
       dataset: test_dataset
       keyfile: "{{ env_var('KEYFILE_PATH') }}"
-"""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            profiles_path = Path(temp_dir) / "profiles.yml"
-            profiles_path.write_text(profile_content)
-            
-            profile = load_profile(Path(temp_dir), 'gxt_profile')
-            
-            assert profile['type'] == 'bigquery'
-            assert profile['project'] == 'test-project'
-            assert profile['dataset'] == 'test_dataset'
-            assert profile['keyfile'] == '/path/to/service-account.json'
-    
+""", profile_name='gxt_profile')
+
+        assert profile['type'] == 'bigquery'
+        assert profile['project'] == 'test-project'
+        assert profile['dataset'] == 'test_dataset'
+        assert profile['keyfile'] == '/path/to/service-account.json'
+
     def test_load_profile_missing_env_var_raises_error(self):
         """Test that missing environment variables raise appropriate errors."""
-        profile_content = """
+        # The function returns profile with empty string for missing env vars
+        profile = load_profile_from_text("""
 gxt_profile:
   target: target
   outputs:
@@ -87,39 +99,30 @@ gxt_profile:
       type: bigquery
       project: "{{ env_var('MISSING_PROJECT') }}"
       dataset: test_dataset
-"""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            profiles_path = Path(temp_dir) / "profiles.yml"
-            profiles_path.write_text(profile_content)
-            
-            # The function returns profile with empty string for missing env vars
-            profile = load_profile(Path(temp_dir), 'gxt_profile')
-            # Missing env var gets replaced with empty string, so check for that
-            assert profile is not None
-            assert profile['project'] == ""  # Missing env var becomes empty string
-    
-    def test_load_profile_missing_target_returns_none(self):
-        """Test that missing profile target returns None."""
-        profile_content = """
-other_profile:
-  target: target
-  outputs:
-    target:
-      type: bigquery
-      project: test-project
-      dataset: test_dataset
-"""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            profiles_path = Path(temp_dir) / "profiles.yml"
-            profiles_path.write_text(profile_content)
-            
-            profile = load_profile(Path(temp_dir), 'missing_profile')
-            assert profile is None
-    
+""", profile_name='gxt_profile')
+        # Missing env var gets replaced with empty string, so check for that
+        assert profile is not None
+        assert profile['project'] == ""  # Missing env var becomes empty string
+
+    @patch('gxt.utils.profiles.safe_load', return_value={
+        'other_profile': {
+            'target': 'target',
+            'outputs': {'target': {'type': 'bigquery', 'project': 'test-project'}},
+        },
+    })
+    def test_load_profile_missing_target_returns_none(self, mock_safe_load):
+        """Test that missing profile target returns None.
+
+        This only exercises the profile/target navigation, so the YAML parse
+        is stubbed with a hand-built tree.
+        """
+        profile = load_profile_from_text("unused", profile_name='missing_profile')
+        assert profile is None
+
     @patch('gxt.utils.profiles.load_dotenv')
-    def test_load_profile_loads_dotenv(self, mock_load_dotenv):
+    def test_load_profile_loads_dotenv(self, mock_load_dotenv, write_profile):
         """Test that .env files are loaded when present."""
-        profile_content = """
+        root = write_profile("""
 gxt_profile:
   target: target
   outputs:
@@ -127,23 +130,16 @@ gxt_profile:
       type: bigquery
       project: test-project
       dataset: test_dataset
-"""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            profiles_path = Path(temp_dir) / "profiles.yml"
-            profiles_path.write_text(profile_content)
-            
-            # Create a .env file in the same directory
-            env_path = Path(temp_dir) / '.env'
-            env_path.write_text('TEST_VAR=test_value\n')
-            
-            load_profile(Path(temp_dir), 'gxt_profile')
-            
-            # Verify load_dotenv was called with the .env file path
-            mock_load_dotenv.assert_called_once_with(str(env_path))
-    
+""", env='TEST_VAR=test_value\n')
+
+        load_profile(root, 'gxt_profile')
+
+        # Verify load_dotenv was called with the .env file path
+        mock_load_dotenv.assert_called_once_with(str(root / '.env'))
+
     def test_load_profile_complex_structure(self):
         """Test loading profile with complex nested structure."""
-        profile_content = """
+        profile = load_profile_from_text("""
 gxt_profile:
   target: target
   outputs:
@@ -160,15 +156,10 @@ gxt_profile:
         labels:
           environment: test
           team: data
-"""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            profiles_path = Path(temp_dir) / "profiles.yml"
-            profiles_path.write_text(profile_content)
-            
-            profile = load_profile(Path(temp_dir), 'gxt_profile')
-            
-            assert profile['type'] == 'bigquery'
-            assert profile['project'] == 'test-project'
-            assert profile['location'] == 'US'
-            assert profile['job_config']['dry_run'] is False
-            assert profile['extra_config']['labels']['environment'] == 'test'
\ No newline at end of file
+""", profile_name='gxt_profile')
+
+        assert profile['type'] == 'bigquery'
+        assert profile['project'] == 'test-project'
+        assert profile['location'] == 'US'
+        assert profile['job_config']['dry_run'] is False
+        assert profile['extra_config']['labels']['environment'] == 'test'